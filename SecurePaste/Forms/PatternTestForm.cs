@@ -154,12 +154,18 @@ namespace SecurePaste.Forms
                     {
                         resultText += $"Pattern matched! Found {totalEntities} occurrence(s) of {_pattern.EntityType}\n";
                         
-                        if (result.analyzer_results != null)
+                        var detections = result.analyzer_results;
+                        if (detections != null)
                         {
+                            List<long> starts = detections.starts.ToObject<List<long>>();
+                            List<long> ends = detections.ends.ToObject<List<long>>();
+                            var spans = await _presidioService.GetSpansAsync(originalText, starts, ends);
+
                             resultText += "\nDetection Details:\n";
-                            foreach (var detection in result.analyzer_results)
+                            for (int i = 0; i < starts.Count; i++)
                             {
-                                resultText += $"- Text: '{detection.text}' | Score: {detection.score:F2} | Position: {detection.start}-{detection.end}\n";
+                                var spanText = i < spans.Count ? spans[i] : string.Empty;
+                                resultText += $"- Text: '{spanText}' | Score: {(double)detections.scores[i]:F2} | Position: {starts[i]}-{ends[i]}\n";
                             }
                         }
                     }
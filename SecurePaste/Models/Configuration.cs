@@ -34,6 +34,12 @@ namespace SecurePaste.Models
         [JsonProperty("language")]
         public string Language { get; set; } = "en";
 
+        /// <summary>
+        /// spaCy model used for NER. en_core_web_sm is faster, en_core_web_lg more accurate.
+        /// </summary>
+        [JsonProperty("nlp_model")]
+        public string NlpModel { get; set; } = "en_core_web_lg";
+
         /// <summary>
         /// Constructor that initializes entities with defaults if not loaded from JSON
         /// </summary>
@@ -178,6 +184,7 @@ namespace SecurePaste.Models
             NotificationsEnabled = true;
             AutoStart = false;
             Language = "en";
+            NlpModel = "en_core_web_lg";
         }
     }
 
@@ -46,6 +46,15 @@ namespace SecurePaste.Services
         /// <returns>JSON string with test results</returns>
         Task<string> TestCustomPatternAsync(string text, CustomPatternConfiguration pattern);
 
+        /// <summary>
+        /// Gets the matched substrings for the offsets of an anonymization result
+        /// </summary>
+        /// <param name="text">Text the offsets refer to</param>
+        /// <param name="starts">Start offsets (Python code points)</param>
+        /// <param name="ends">End offsets (Python code points)</param>
+        /// <returns>Matched substrings, in the same order as the offsets</returns>
+        Task<IReadOnlyList<string>> GetSpansAsync(string text, IReadOnlyList<long> starts, IReadOnlyList<long> ends);
+
         /// <summary>
         /// Validates a custom pattern configuration
         /// </summary>
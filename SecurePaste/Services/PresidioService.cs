@@ -4,6 +4,7 @@ using Microsoft.Extensions.Hosting;
 using Newtonsoft.Json;
 using SecurePaste.Models;
 using System.Diagnostics;
+using System.Text;
 
 namespace SecurePaste.Services
 {
@@ -26,36 +27,18 @@ namespace SecurePaste.Services
 
             try
             {
-                var config = _configService.GetConfiguration();
-                var presidioConfig = new
-                {
-                    entities = config.Entities.Where(e => e.Enabled).Select(e => new
-                    {
-                        type = e.Type,
-                        anonymization_method = e.AnonymizationMethod,
-                        custom_replacement = e.CustomReplacement
-                    }).ToArray(),
-                    custom_patterns = config.CustomPatterns.Where(p => p.Enabled).Select(p => new
-                    {
-                        name = p.Name,
-                        pattern = p.Pattern,
-                        entity_type = p.EntityType,
-                        enabled = p.Enabled,
-                        confidence_score = p.ConfidenceScore,
-                        anonymization_method = p.AnonymizationMethod,
-                        custom_replacement = p.CustomReplacement,
-                        description = p.Description
-                    }).ToArray(),
-                    confidence_threshold = config.ConfidenceThreshold,
-                    language = config.Language
-                };
-
-                var configJson = JsonConvert.SerializeObject(presidioConfig);
+                var textUtf8 = Encoding.UTF8.GetBytes(text);
+                var configUtf8 = Encoding.UTF8.GetBytes(BuildPresidioConfigJson());
                 var module = _pythonEnv.SecurepasteAnonymizer();
-                var resultJson = await Task.Run(() => module.AnonymizeText(text, configJson));
+                var resultUtf8 = await Task.Run(() => module.AnonymizeTextB(textUtf8, configUtf8));
 
-                var result = JsonConvert.DeserializeObject<AnonymizationResult>(resultJson);
-                return result?.AnonymizedText ?? text;
+                var result = DeserializeUtf8<AnonymizationResult>(resultUtf8);
+                if (result is not { Success: true })
+                {
+                    Debug.WriteLine($"Anonymization failed: {result?.Error}");
+                    return text;
+                }
+                return result.AnonymizedText;
             }
             catch (Exception ex)
             {
@@ -64,6 +47,42 @@ namespace SecurePaste.Services
             }
         }
 
+        private static T? DeserializeUtf8<T>(byte[] json)
+        {
+            using var reader = new JsonTextReader(new StreamReader(new MemoryStream(json), Encoding.UTF8));
+            return JsonSerializer.CreateDefault().Deserialize<T>(reader);
+        }
+
+        private string BuildPresidioConfigJson()
+        {
+            var config = _configService.GetConfiguration();
+            var presidioConfig = new
+            {
+                entities = config.Entities.Where(e => e.Enabled).Select(e => new
+                {
+                    type = e.Type,
+                    anonymization_method = e.AnonymizationMethod,
+                    custom_replacement = e.CustomReplacement
+                }).ToArray(),
+                custom_patterns = config.CustomPatterns.Where(p => p.Enabled).Select(p => new
+                {
+                    name = p.Name,
+                    pattern = p.Pattern,
+                    entity_type = p.EntityType,
+                    enabled = p.Enabled,
+                    confidence_score = p.ConfidenceScore,
+                    anonymization_method = p.AnonymizationMethod,
+                    custom_replacement = p.CustomReplacement,
+                    description = p.Description
+                }).ToArray(),
+                confidence_threshold = config.ConfidenceThreshold,
+                language = config.Language,
+                nlp_model = config.NlpModel
+            };
+
+            return JsonConvert.SerializeObject(presidioConfig);
+        }
+
         public async Task<bool> CheckPresidioInstallationAsync()
         {
             try
@@ -158,7 +177,8 @@ namespace SecurePaste.Services
                         }
                     },
                     confidence_threshold = Math.Min(pattern.ConfidenceScore - 0.1, 0.1),
-                    language = "en"
+                    language = "en",
+                    include_debug = true // Detection details for the test dialog
                 };
 
                 var configJson = JsonConvert.SerializeObject(testConfig);
@@ -172,6 +192,23 @@ namespace SecurePaste.Services
             }
         }
 
+        public async Task<IReadOnlyList<string>> GetSpansAsync(string text, IReadOnlyList<long> starts, IReadOnlyList<long> ends)
+        {
+            if (starts.Count == 0)
+                return Array.Empty<string>();
+
+            try
+            {
+                var module = _pythonEnv.SecurepasteAnonymizer();
+                return await Task.Run(() => module.GetSpans(text, starts, ends));
+            }
+            catch (Exception ex)
+            {
+                Debug.WriteLine($"Failed to get spans: {ex}");
+                return Array.Empty<string>();
+            }
+        }
+
         public async Task<string> ValidateCustomPatternAsync(CustomPatternConfiguration pattern)
         {
             try
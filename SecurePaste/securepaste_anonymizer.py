@@ -1,19 +1,227 @@
+import os
 import sys
 import json
 import re
-from typing import Optional, Dict, Any, List
+import hashlib
+import itertools
+import threading
+import types
+import weakref
+import multiprocessing
+import multiprocessing.spawn
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional, Dict, Any, List, Sequence, Tuple
 
 PRESIDIO_AVAILABLE = True
 PRESIDIO_ERROR = None
 try:
-    from presidio_analyzer import AnalyzerEngine, Pattern, PatternRecognizer
+    from presidio_analyzer import (
+        AnalyzerEngine, EntityRecognizer, Pattern, PatternRecognizer, RecognizerRegistry, RecognizerResult
+    )
+    from presidio_analyzer.nlp_engine import NerModelConfiguration, NlpEngineProvider, SpacyNlpEngine
+    from presidio_analyzer.predefined_recognizers import SpacyRecognizer
+    import regex  # Presidio's regex engine, a dependency of presidio_analyzer
+    import spacy
     from presidio_anonymizer import AnonymizerEngine
     from presidio_anonymizer.entities import OperatorConfig
 except ImportError as e:
     PRESIDIO_AVAILABLE = False
     PRESIDIO_ERROR = str(e)
 
-class PasswordPatternRecognizer(PatternRecognizer):
+# Optional: orjson is a much faster JSON encoder/decoder for the C# bridge. It rejects
+# strings with lone surrogates (which pasted text can contain); those are encoded with
+# json instead, which escapes them as \udXXX.
+try:
+    import orjson
+    
+    def _dumps(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return json.dumps(obj)
+    
+    def _dumps_indented(obj: Any) -> str:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return json.dumps(obj, indent=2)
+    
+    def _dumps_sorted_bytes(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+        except orjson.JSONEncodeError:
+            return json.dumps(obj, sort_keys=True).encode('utf-8')
+    
+    def _dumps_bytes(obj: Any) -> bytes:
+        try:
+            return orjson.dumps(obj)
+        except orjson.JSONEncodeError:
+            return json.dumps(obj).encode('utf-8')
+    
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj)
+    
+    def _dumps_indented(obj: Any) -> str:
+        return json.dumps(obj, indent=2)
+    
+    def _dumps_sorted_bytes(obj: Any) -> bytes:
+        return json.dumps(obj, sort_keys=True).encode('utf-8')
+    
+    def _dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+    
+    _loads = json.loads
+
+# Optional: Hyperscan lets us prefilter all patterns of a recognizer in one pass
+HYPERSCAN_AVAILABLE = True
+try:
+    import hyperscan
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Optional: RE2 finds password matches in linear time, without backtracking
+RE2_AVAILABLE = True
+try:
+    import re2
+except ImportError:
+    RE2_AVAILABLE = False
+
+# Optional: Aho-Corasick finds any of the entity trigger keywords in one pass
+AHOCORASICK_AVAILABLE = True
+try:
+    import ahocorasick
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Optional: msgpack is the wire format of serve(), for hosts that run this module out of process
+MSGPACK_AVAILABLE = True
+try:
+    import msgpack
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Optional: Numba JIT-compiles the overlap resolution over analyzer results
+NUMBA_AVAILABLE = True
+try:
+    import numpy as np
+    from numba import njit
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+class HyperscanPrefilter:
+    """
+    Compiles a set of regexes into a single Hyperscan database and answers, in one
+    pass over the text, whether any of them can match. Patterns are compiled in
+    prefilter mode so the answer is never a false negative (non-ASCII text is never
+    ruled out); a positive answer still needs to be confirmed by the regular regex engine.
+    """
+    
+    FLAGS = 0
+    if HYPERSCAN_AVAILABLE:
+        FLAGS = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_DOTALL | hyperscan.HS_FLAG_MULTILINE |
+                 hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP | hyperscan.HS_FLAG_SINGLEMATCH |
+                 hyperscan.HS_FLAG_PREFILTER | hyperscan.HS_FLAG_ALLOWEMPTY)
+    
+    def __init__(self, regexes: List[str]):
+        self.database = None
+        self._lock = threading.Lock()
+        
+        if not HYPERSCAN_AVAILABLE or not regexes:
+            return
+        
+        try:
+            database = hyperscan.Database()
+            database.compile(
+                expressions=[regex.encode('utf-8') for regex in regexes],
+                ids=list(range(len(regexes))),
+                elements=len(regexes),
+                flags=[self.FLAGS] * len(regexes)
+            )
+            self.database = database
+        except Exception:
+            # Syntax Hyperscan doesn't support - always fall back to the regex engine
+            self.database = None
+    
+    def may_match(self, text) -> bool:
+        """Returns False only if none of the patterns can match the text (str or UTF-8 bytes)."""
+        if self.database is None:
+            return True
+        
+        # Hyperscan's Unicode tables and case folding differ from the regex package's
+        # (\w without combining marks, 'i' not matching 'İ', ...), so only ASCII text,
+        # where both agree, can be ruled out
+        if not text.isascii():
+            return True
+        data = text.encode('ascii') if isinstance(text, str) else text
+        
+        def on_match(pattern_id, start, end, flags, context):
+            return True  # Stop at the first hit
+        
+        with self._lock:
+            try:
+                self.database.scan(data, match_event_handler=on_match)
+            except hyperscan.ScanTerminated:
+                return True
+        
+        return False
+
+class CompiledPatternRecognizer(PatternRecognizer):
+    """
+    PatternRecognizer whose patterns are compiled when it is created rather than on
+    its first analyze() call. Like Presidio's predefined pattern recognizers, it is
+    skipped for texts its Hyperscan prefilter rules out (see PrefilteredRecognizerRegistry).
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        # Compile up front (into the cache Presidio checks before compiling) so the
+        # first analyze() call doesn't pay for it
+        for pattern in self.patterns:
+            if pattern.compiled_regex is None or pattern.compiled_with_flags != self.global_regex_flags:
+                pattern.compiled_regex = regex.compile(pattern.regex, flags=self.global_regex_flags)
+                pattern.compiled_with_flags = self.global_regex_flags
+
+def _find_password_anchor(buf):
+    """
+    Scans ASCII text bytes for the keywords a password match starts with, ignoring case.
+    Returns the offset of the first "pass", "pwd", "user" or "login" (where the earliest
+    match can start), or -1 if there is no "pass"/"pwd" at all (so no match either).
+    """
+    n = len(buf)
+    first = -1
+    for i in range(n):
+        c = buf[i] | 0x20  # ASCII lowercase
+        if c == 0x70:  # p: "pwd" or "pass" (including "password")
+            if ((i + 2 < n and buf[i + 1] | 0x20 == 0x77 and buf[i + 2] | 0x20 == 0x64) or
+                    (i + 3 < n and buf[i + 1] | 0x20 == 0x61 and buf[i + 2] | 0x20 == 0x73 and
+                     buf[i + 3] | 0x20 == 0x73)):
+                return i if first == -1 else first
+        elif first == -1:
+            if c == 0x75:  # u: "user" (including "username")
+                if (i + 3 < n and buf[i + 1] | 0x20 == 0x73 and buf[i + 2] | 0x20 == 0x65 and
+                        buf[i + 3] | 0x20 == 0x72):
+                    first = i
+            elif c == 0x6c:  # l: "login"
+                if (i + 4 < n and buf[i + 1] | 0x20 == 0x6f and buf[i + 2] | 0x20 == 0x67 and
+                        buf[i + 3] | 0x20 == 0x69 and buf[i + 4] | 0x20 == 0x6e):
+                    first = i
+    return -1
+
+# Numba compiles Python bytecode, which the Cython build of this module (setup.py) has none of
+if NUMBA_AVAILABLE and not isinstance(_find_password_anchor, types.FunctionType):
+    NUMBA_AVAILABLE = False
+
+if NUMBA_AVAILABLE:
+    # Compiled lazily on first call, see _warmup()
+    _find_password_anchor_jit = njit(cache=True)(_find_password_anchor)
+
+class PasswordPatternRecognizer(CompiledPatternRecognizer):
     """
     Custom PatternRecognizer for detecting passwords in various formats.
     Detects passwords in contexts like:
@@ -24,45 +232,73 @@ class PasswordPatternRecognizer(PatternRecognizer):
     - Login credential pairs: username=user password=pass
     """
     
+    # All password formats as one alternation, so the text is scanned once instead of
+    # once per format. Each alternative captures the password value in its own named
+    # group, so match.lastgroup tells which alternative matched.
+    # Every repetition is possessive and the keyword is an atomic group: each is followed
+    # by something it can't match itself (\s* by ':' or '=', the value by a quote or the
+    # end of the match), so giving characters back could never lead to a match and the
+    # engine doesn't try. No \b before the keyword: DB_PASSWORD=... must still match.
+    PASSWORD_KEYWORD = r"(?>password|pwd|pass)"
+    PASSWORD_VALUE = r"[^\s\'\"]{6,}+"
+    UNIFIED_REGEX = "|".join([
+        # Quoted passwords - double quotes
+        PASSWORD_KEYWORD + r"\s*+[:=]\s*+\"(?P<quoted_double>[^\"]{6,}+)\"",
+        # Quoted passwords - single quotes
+        PASSWORD_KEYWORD + r"\s*+[:=]\s*+'(?P<quoted_single>[^']{6,}+)'",
+        # Login credential pairs - username=user password=pass
+        r"(?:username|user|login)\s*+[:=]\s*+\S++\s++" + PASSWORD_KEYWORD + r"\s*+[:=]\s*+(?P<login_pair>" + PASSWORD_VALUE + ")",
+        # password: value, pwd: value, pass: value
+        PASSWORD_KEYWORD + r"\s*+:\s*+(?P<colon>" + PASSWORD_VALUE + ")",
+        # password = value, pwd = value
+        PASSWORD_KEYWORD + r"\s*+=\s*+(?P<equals>" + PASSWORD_VALUE + ")",
+        # password is value
+        PASSWORD_KEYWORD + r"\s++is\s++(?P<is_phrase>" + PASSWORD_VALUE + ")"
+    ])
+    
+    # Score per alternative, keyed by capture group name
+    GROUP_SCORES = {
+        "quoted_double": 0.9,
+        "quoted_single": 0.9,
+        "login_pair": 0.85,
+        "colon": 0.8,
+        "equals": 0.8,
+        "is_phrase": 0.7
+    }
+    
     PATTERNS = [
-        # Pattern 1: password: value, pwd: value, pass: value (case insensitive)
         Pattern(
-            name="password_colon_pattern",
-            regex=r"(?i)(?:password|pwd|pass)\s*:\s*([^\s\'\"]{6,})",
+            name="password_unified",
+            regex=UNIFIED_REGEX,
             score=0.8
-        ),
-        # Pattern 2: password = value, pwd = value (case insensitive)
-        Pattern(
-            name="password_equals_pattern", 
-            regex=r"(?i)(?:password|pwd|pass)\s*=\s*([^\s\'\"]{6,})",
-            score=0.8
-        ),
-        # Pattern 3: password is value
-        Pattern(
-            name="password_is_pattern",
-            regex=r"(?i)(?:password|pwd|pass)\s+is\s+([^\s\'\"]{6,})",
-            score=0.7
-        ),
-        # Pattern 4: Quoted passwords - double quotes
-        Pattern(
-            name="password_quoted_double",
-            regex=r"(?i)(?:password|pwd|pass)\s*[:=]\s*\"([^\"]{6,})\"",
-            score=0.9
-        ),
-        # Pattern 5: Quoted passwords - single quotes
-        Pattern(
-            name="password_quoted_single",
-            regex=r"(?i)(?:password|pwd|pass)\s*[:=]\s*'([^']{6,})'",
-            score=0.9
-        ),
-        # Pattern 6: Login credential pairs - username=user password=pass
-        Pattern(
-            name="login_credentials_pattern",
-            regex=r"(?i)(?:username|user|login)\s*[:=]\s*\S+\s+(?:password|pwd|pass)\s*[:=]\s*([^\s\'\"]{6,})",
-            score=0.85
         )
     ]
     
+    # The pattern with the regex package's matching semantics (what Presidio matches
+    # UNIFIED_REGEX with) spelled out, for RE2, which has no flags argument and an
+    # ASCII-only \s. Whitespace is listed explicitly, as is the dotted capital I that
+    # regex's IGNORECASE also accepts for "i" (RE2's case folding doesn't), both as
+    # literal characters since the engines share no \x/\u escape syntax.
+    _WHITESPACE = "".join(c for c in map(chr, range(0x3001)) if regex.match(r"\s", c))
+    SCAN_REGEX = "(?i)" + (UNIFIED_REGEX
+                           .replace("|login)", "|log[i\u0130]n)")
+                           .replace(r"\s++is\s++", r"\s++[i" + "\u0130" + r"]s\s++")
+                           .replace(r"[^\s", "[^" + _WHITESPACE)
+                           .replace(r"\s", "[" + _WHITESPACE + "]")
+                           .replace(r"\S", "[^" + _WHITESPACE + "]"))
+    
+    # Scanned with the regex package (Presidio's engine), about 40% faster than re here
+    UNIFIED_PATTERN = regex.compile(SCAN_REGEX, regex.DOTALL | regex.MULTILINE | regex.V0)
+    
+    # RE2 never backtracks and has neither possessive quantifiers nor atomic groups
+    RE2_PATTERN = None
+    if RE2_AVAILABLE:
+        try:
+            RE2_PATTERN = re2.compile(SCAN_REGEX.replace("(?>", "(?:").replace("++", "+")
+                                      .replace("*+", "*").replace("}+", "}"))
+        except Exception as e:
+            print(f"RE2 rejected the password pattern, using re only: {e}")
+    
     CONTEXT = [
         "password", "pwd", "pass", "credential", "auth", "login", 
         "signin", "authentication", "secret", "key"
@@ -75,8 +311,58 @@ class PasswordPatternRecognizer(PatternRecognizer):
             context=self.CONTEXT,
             supported_language="en"
         )
+    
+    def analyze(self, text, entities, nlp_artifacts=None, regex_flags=None):
+        position = 0
+        if self.RE2_PATTERN is not None:
+            # One linear-time RE2 pass finds where the first password starts, or that
+            # there is none, before the overlapping scan below
+            try:
+                first = self.RE2_PATTERN.search(text)
+                if first is None:
+                    return []
+                position = first.start()
+            except UnicodeEncodeError:
+                pass  # Lone surrogates, which RE2 can't encode; the scan below covers the whole text
+        elif NUMBA_AVAILABLE and text.isascii():
+            # Without RE2, a JIT-compiled byte scan skips to the first keyword a match can
+            # start with (in ASCII text, case-insensitive matching is plain ASCII folding)
+            position = _find_password_anchor_jit(np.frombuffer(text.encode('ascii'), np.uint8))
+            if position < 0:
+                return []
+        
+        results = []
+        while True:
+            # Resume right after each match start (not its end) so overlapping matches of
+            # different formats are all found, as they were with one regex per format
+            match = self.UNIFIED_PATTERN.search(text, position)
+            if match is None:
+                break
+            position = match.start() + 1
+            
+            score = self.GROUP_SCORES[match.lastgroup]
+            results.append(RecognizerResult(
+                entity_type="PASSWORD",
+                start=match.start(),
+                end=match.end(),
+                score=score,
+                analysis_explanation=self.build_regex_explanation(
+                    self.name,
+                    "password_unified",
+                    self.UNIFIED_REGEX,
+                    score,
+                    None,
+                    self.UNIFIED_PATTERN.flags
+                ),
+                recognition_metadata={
+                    RecognizerResult.RECOGNIZER_NAME_KEY: self.name,
+                    RecognizerResult.RECOGNIZER_IDENTIFIER_KEY: self.id
+                }
+            ))
+        
+        return EntityRecognizer.remove_duplicates(results)
 
-class CustomPatternRecognizer(PatternRecognizer):
+class CustomPatternRecognizer(CompiledPatternRecognizer):
     """
     Dynamic PatternRecognizer that can be configured with custom regex patterns
     """
@@ -93,6 +379,142 @@ class CustomPatternRecognizer(PatternRecognizer):
         )
         self.name = name
 
+# Hyperscan prefilter per pattern recognizer. The predefined recognizers are shared by
+# every analyzer (see _clone_analyzer), so each database is compiled only once.
+_PREFILTERS = weakref.WeakKeyDictionary()
+_PREFILTERS_LOCK = threading.Lock()
+
+def _get_prefilter(recognizer: EntityRecognizer) -> Optional[HyperscanPrefilter]:
+    """Returns the Hyperscan prefilter for a recognizer, or None if it can't be prefiltered."""
+    if not isinstance(recognizer, PatternRecognizer) or not recognizer.patterns:
+        return None
+    # Recognizers with their own analyze() may report more than their patterns match (IBAN)
+    # or match with other regexes (the password recognizer scans with SCAN_REGEX)
+    if type(recognizer).analyze is not PatternRecognizer.analyze:
+        return None
+    
+    with _PREFILTERS_LOCK:
+        prefilter = _PREFILTERS.get(recognizer)
+    if prefilter is None:
+        # Compiled outside the lock, it can take seconds (the URL recognizer's TLD list)
+        prefilter = HyperscanPrefilter([pattern.regex for pattern in recognizer.patterns])
+        with _PREFILTERS_LOCK:
+            prefilter = _PREFILTERS.setdefault(recognizer, prefilter)
+    return prefilter
+
+class PrefilteredRecognizerRegistry(RecognizerRegistry):
+    """
+    RecognizerRegistry that leaves out the pattern recognizers that can't match the
+    text being analyzed. Each recognizer is checked with a single Hyperscan pass over
+    the text instead of one regex pass per pattern.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._local = threading.local()
+    
+    def set_text(self, text: Optional[str]) -> None:
+        """Sets the text that get_recognizers() selects recognizers for on this thread."""
+        self._local.text = text
+    
+    def get_recognizers(self, *args, **kwargs) -> List[EntityRecognizer]:
+        recognizers = super().get_recognizers(*args, **kwargs)
+        text = getattr(self._local, 'text', None)
+        # The prefilters only rule out ASCII text, see HyperscanPrefilter.may_match
+        if not HYPERSCAN_AVAILABLE or text is None or not text.isascii():
+            return recognizers
+        
+        data = text.encode('ascii')
+        selected = []
+        for recognizer in recognizers:
+            prefilter = _get_prefilter(recognizer)
+            if prefilter is None or prefilter.may_match(data):
+                selected.append(recognizer)
+        return selected
+
+class PrefilteredAnalyzerEngine(AnalyzerEngine):
+    """
+    AnalyzerEngine on a PrefilteredRecognizerRegistry, which it tells the text it is
+    analyzing so that only recognizers that can match it are run.
+    """
+    
+    def __init__(self, registry: Optional[RecognizerRegistry] = None, **kwargs):
+        if registry is None:
+            registry = PrefilteredRecognizerRegistry(supported_languages=kwargs.get('supported_languages') or ["en"])
+        super().__init__(registry=registry, **kwargs)
+    
+    def analyze(self, text: str, *args, **kwargs):
+        if not isinstance(self.registry, PrefilteredRecognizerRegistry):
+            return super().analyze(text, *args, **kwargs)
+        
+        self.registry.set_text(text)
+        try:
+            return super().analyze(text, *args, **kwargs)
+        finally:
+            self.registry.set_text(None)
+
+# Default spaCy model; requests can pick another installed one via config['nlp_model']
+# (e.g. en_core_web_sm trades some NER recall for roughly half the latency)
+NLP_MODEL = "en_core_web_lg"
+
+class TrimmedSpacyNlpEngine(SpacyNlpEngine):
+    """
+    SpacyNlpEngine that loads its models without the pipeline components Presidio
+    doesn't use, so every analyzed text skips them.
+    """
+    
+    # Presidio only reads tokens, lemmas and entities. The tagger and attribute_ruler
+    # stay enabled because the lemmatizer (used for context words) depends on them.
+    DISABLED_COMPONENTS = ["parser"]
+    
+    # Only SpacyRecognizer reads the entities, so requests it doesn't serve can skip NER
+    NER_COMPONENTS = ["ner"]
+    
+    def load(self) -> None:
+        # Same as SpacyNlpEngine.load (including downloading a missing model), apart
+        # from the disabled components
+        self._enable_gpu()
+        
+        self.nlp = {}
+        for model in self.models:
+            self._validate_model_params(model)
+            self._download_spacy_model_if_needed(model["model_name"])
+            self.nlp[model["lang_code"]] = spacy.load(model["model_name"], disable=self.DISABLED_COMPONENTS)
+    
+    def process_text(self, text: str, language: str, disable: Sequence[str] = ()):
+        """process_text that can also skip the given pipeline components for this text."""
+        if not disable:
+            return super().process_text(text, language)
+        
+        doc = self.nlp[language](text, disable=disable)
+        return self._doc_to_nlp_artifact(doc, language)
+    
+    def process_batch(self, texts, language: str, batch_size: int = 1, n_process: int = 1,
+                      as_tuples: bool = False, disable: Sequence[str] = ()):
+        """process_batch that can also skip the given pipeline components for these texts."""
+        if not disable or as_tuples:
+            return super().process_batch(texts, language, batch_size, n_process, as_tuples)
+        
+        docs = self.nlp[language].pipe(texts, batch_size=batch_size, n_process=n_process, disable=disable)
+        return ((doc.text, self._doc_to_nlp_artifact(doc, language)) for doc in docs)
+
+@lru_cache(maxsize=1)
+def _default_ner_model_configuration() -> "NerModelConfiguration":
+    """
+    The NER label mapping and ignored labels from Presidio's conf/default.yaml, which a
+    plain AnalyzerEngine() uses; SpacyNlpEngine's own defaults differ from it.
+    """
+    return NerModelConfiguration.from_dict(NlpEngineProvider().nlp_configuration["ner_model_configuration"])
+
+def create_nlp_engine(model_name: str = NLP_MODEL) -> SpacyNlpEngine:
+    """Creates the trimmed spaCy NLP engine for the given model."""
+    nlp_engine = TrimmedSpacyNlpEngine(
+        models=[{"lang_code": "en", "model_name": model_name}],
+        ner_model_configuration=_default_ner_model_configuration()
+    )
+    nlp_engine.load()
+    return nlp_engine
+
 def setup_analyzer_with_password_recognizer() -> AnalyzerEngine:
     """
     Creates an AnalyzerEngine with the custom password recognizer added.
@@ -102,7 +524,7 @@ def setup_analyzer_with_password_recognizer() -> AnalyzerEngine:
         return None
     
     # Create the standard analyzer
-    analyzer = AnalyzerEngine()
+    analyzer = PrefilteredAnalyzerEngine(nlp_engine=create_nlp_engine())
     
     # Create and add the custom password recognizer
     password_recognizer = PasswordPatternRecognizer()
@@ -110,6 +532,14 @@ def setup_analyzer_with_password_recognizer() -> AnalyzerEngine:
     
     return analyzer
 
+@lru_cache(maxsize=256)
+def _compile_pattern(pattern: str, flags: int = 0):
+    """
+    Compiles a custom regex once per (pattern, flags); stable pattern sets are never recompiled.
+    Uses the regex package, which Presidio matches custom patterns with.
+    """
+    return regex.compile(pattern, flags)
+
 def create_custom_recognizers(custom_patterns_config: List[Dict[str, Any]]) -> List[CustomPatternRecognizer]:
     """
     Creates custom pattern recognizers from configuration
@@ -122,8 +552,7 @@ def create_custom_recognizers(custom_patterns_config: List[Dict[str, Any]]) -> L
             
         try:
             # Validate the regex pattern
-            import re
-            re.compile(pattern_config['pattern'])
+            _compile_pattern(pattern_config['pattern'])
             
             pattern = Pattern(
                 name=pattern_config['name'],
@@ -155,7 +584,7 @@ def setup_analyzer_with_custom_patterns(custom_patterns_config: List[Dict[str, A
         return None
     
     # Create the standard analyzer
-    analyzer = AnalyzerEngine()
+    analyzer = PrefilteredAnalyzerEngine(nlp_engine=create_nlp_engine())
     
     # Add the custom password recognizer
     password_recognizer = PasswordPatternRecognizer()
@@ -173,133 +602,684 @@ def setup_analyzer_with_custom_patterns(custom_patterns_config: List[Dict[str, A
 ANALYZER = setup_analyzer_with_custom_patterns() if PRESIDIO_AVAILABLE else None
 ANONYMIZER = AnonymizerEngine() if PRESIDIO_AVAILABLE else None
 
+# Analyzers with custom patterns, keyed by a hash of the pattern config (LRU order)
+ANALYZER_CACHE_SIZE = 32
+_ANALYZER_CACHE: "OrderedDict[str, AnalyzerEngine]" = OrderedDict()
+_ANALYZER_CACHE_LOCK = threading.Lock()
+
+def _clone_analyzer(base: AnalyzerEngine, recognizers: List[PatternRecognizer],
+                    nlp_engine: Optional[SpacyNlpEngine] = None) -> AnalyzerEngine:
+    """
+    Creates an analyzer that shares the predefined recognizers and (unless another one
+    is given) the NLP engine of the base analyzer, with the given recognizers added on top.
+    """
+    registry = PrefilteredRecognizerRegistry(
+        recognizers=list(base.registry.recognizers),
+        global_regex_flags=base.registry.global_regex_flags,
+        supported_languages=base.registry.supported_languages
+    )
+    for recognizer in recognizers:
+        registry.add_recognizer(recognizer)
+    
+    return PrefilteredAnalyzerEngine(
+        registry=registry,
+        nlp_engine=nlp_engine or base.nlp_engine,
+        supported_languages=base.supported_languages
+    )
+
+# NLP engines for models other than NLP_MODEL, loaded on first use
+_NLP_ENGINES: Dict[str, SpacyNlpEngine] = {}
+_NLP_ENGINES_LOCK = threading.Lock()
+
+def _get_nlp_engine(model_name: str) -> SpacyNlpEngine:
+    """
+    Returns the NLP engine for the given spaCy model, loading it once. Falls back to
+    the default engine if the model can't be loaded, so text still gets anonymized.
+    """
+    if model_name == NLP_MODEL:
+        return ANALYZER.nlp_engine
+    
+    with _NLP_ENGINES_LOCK:
+        if model_name not in _NLP_ENGINES:
+            # Only models that are already installed: create_nlp_engine would otherwise
+            # download the model (or exit on an unknown name) in the middle of a request
+            if not (spacy.util.is_package(model_name) or Path(model_name).exists()):
+                print(f"spaCy model '{model_name}' is not installed, using '{NLP_MODEL}'")
+                _NLP_ENGINES[model_name] = ANALYZER.nlp_engine
+            else:
+                try:
+                    _NLP_ENGINES[model_name] = create_nlp_engine(model_name)
+                except Exception as e:
+                    print(f"Error loading spaCy model '{model_name}', using '{NLP_MODEL}': {e}")
+                    _NLP_ENGINES[model_name] = ANALYZER.nlp_engine
+        return _NLP_ENGINES[model_name]
+
+def _get_analyzer(custom_patterns_config: List[Dict[str, Any]], nlp_model: str = NLP_MODEL) -> AnalyzerEngine:
+    """
+    Returns an analyzer for the given custom patterns and spaCy model, building it only
+    the first time the combination is seen. Falls back to the shared ANALYZER without
+    custom patterns on the default model.
+    """
+    if not custom_patterns_config and nlp_model == NLP_MODEL:
+        return ANALYZER
+    
+    key = hashlib.blake2b(
+        _dumps_sorted_bytes([nlp_model, custom_patterns_config]),
+        digest_size=16
+    ).hexdigest()
+    
+    with _ANALYZER_CACHE_LOCK:
+        analyzer = _ANALYZER_CACHE.get(key)
+        if analyzer is not None:
+            _ANALYZER_CACHE.move_to_end(key)
+            return analyzer
+    
+    # Build outside the lock so a slow build doesn't block cache hits
+    analyzer = _clone_analyzer(
+        ANALYZER,
+        create_custom_recognizers(custom_patterns_config),
+        _get_nlp_engine(nlp_model)
+    )
+    
+    with _ANALYZER_CACHE_LOCK:
+        analyzer = _ANALYZER_CACHE.setdefault(key, analyzer)
+        _ANALYZER_CACHE.move_to_end(key)
+        while len(_ANALYZER_CACHE) > ANALYZER_CACHE_SIZE:
+            _ANALYZER_CACHE.popitem(last=False)
+    
+    return analyzer
+
+# Operators without per-request parameters, created once and shared by every request
+# (the anonymizer copies their params before use, so they are never mutated)
+_REDACT_OPERATOR = OperatorConfig('redact')
+_MASK_OPERATOR = OperatorConfig('mask', {'masking_char': '*', 'chars_to_mask': 7, 'from_end': False})
+_HASH_OPERATOR = OperatorConfig('hash')
+_ENCRYPT_OPERATOR = OperatorConfig('encrypt')
+
+# Anonymization method -> OperatorConfig factory taking the custom replacement
+_OPERATOR_FACTORIES = {
+    'redact': lambda replacement: _REDACT_OPERATOR,
+    'replace': lambda replacement: OperatorConfig('replace', {'new_value': replacement or '[REDACTED]'}),
+    'mask': lambda replacement: _MASK_OPERATOR,
+    'hash': lambda replacement: _HASH_OPERATOR,
+    'encrypt': lambda replacement: _ENCRYPT_OPERATOR
+}
+
+@lru_cache(maxsize=512)
 def create_operator_config(method: str, custom_replacement: Optional[str] = None):
-    """Create Presidio OperatorConfig object."""
-    if method == 'redact':
-        return OperatorConfig('redact')
-    elif method == 'replace':
-        return OperatorConfig('replace', {'new_value': custom_replacement or '[REDACTED]'})
-    elif method == 'mask':
-        return OperatorConfig('mask', {'masking_char': '*', 'chars_to_mask': 7, 'from_end': False})
-    elif method == 'hash':
-        return OperatorConfig('hash')
-    elif method == 'encrypt':
-        return OperatorConfig('encrypt')
-    return OperatorConfig('redact')
+    """
+    Create Presidio OperatorConfig object (redact for unknown methods).
+    Replace operators are interned per replacement, the others are singletons.
+    """
+    return _OPERATOR_FACTORIES.get(method, _OPERATOR_FACTORIES['redact'])(custom_replacement)
 
-def anonymize_text(text: str, config_json: str) -> str:
-    """Main function called from C#."""
-    if not PRESIDIO_AVAILABLE:
-        return json.dumps({
-            'success': False,
-            'error': f'Presidio not available: {PRESIDIO_ERROR}',
-            'anonymized_text': text
-        })
+def _mark_contained(starts, ends, scores, order, keep):
+    """
+    Clears keep[i] for every span that lies within an earlier kept span (in the given
+    order: start ascending, end and score descending, then entity type) with an equal
+    or higher score.
+    Works on plain lists and, JIT-compiled by Numba, on numpy arrays.
+    """
+    # Kept spans that can still contain later ones: active[:size]
+    active = [0] * len(order)
+    size = 0
+    for i in range(len(order)):
+        current = order[i]
+        
+        # Later spans start at or after this one, so kept spans that end before it starts
+        # can't contain this or any later span
+        remaining = 0
+        for k in range(size):
+            other = active[k]
+            if ends[other] >= starts[current]:
+                active[remaining] = other
+                remaining += 1
+        size = remaining
+        
+        contained = False
+        for k in range(size):
+            other = active[k]
+            if ends[other] >= ends[current] and scores[other] >= scores[current]:
+                contained = True
+                break
+        if contained:
+            keep[current] = False
+        else:
+            active[size] = current
+            size += 1
+
+if NUMBA_AVAILABLE:
+    # Compiled lazily on first call, see _warmup()
+    _mark_contained_jit = njit(cache=True)(_mark_contained)
+
+def remove_contained_results(analyzer_results: List[Any]) -> List[Any]:
+    """
+    Drops analyzer results whose span lies entirely within another result with an
+    equal or higher score, before they are handed to the anonymizer. Partially
+    overlapping results are all kept, so no text is left un-anonymized by this.
+    Of results with the same span and score, the entity type first in alphabetical
+    order is kept, whatever order the recognizers ran in.
+    """
+    count = len(analyzer_results)
+    if count < 2:
+        return analyzer_results
     
-    try:
-        config = json.loads(config_json)
+    type_ranks = {entity_type: rank for rank, entity_type
+                  in enumerate(sorted({res.entity_type for res in analyzer_results}))}
+    types = [type_ranks[res.entity_type] for res in analyzer_results]
+    
+    if NUMBA_AVAILABLE:
+        starts = np.fromiter((res.start for res in analyzer_results), np.int64, count)
+        ends = np.fromiter((res.end for res in analyzer_results), np.int64, count)
+        scores = np.fromiter((res.score for res in analyzer_results), np.float64, count)
+        order = np.lexsort((types, -scores, -ends, starts))
+        keep = np.ones(count, np.bool_)
+        _mark_contained_jit(starts, ends, scores, order, keep)
+    else:
+        starts = [res.start for res in analyzer_results]
+        ends = [res.end for res in analyzer_results]
+        scores = [res.score for res in analyzer_results]
+        order = sorted(range(count), key=lambda i: (starts[i], -ends[i], -scores[i], types[i]))
+        keep = [True] * count
+        _mark_contained(starts, ends, scores, order, keep)
+    
+    return [res for res, kept in zip(analyzer_results, keep) if kept]
+
+# Texts longer than MIN_CHUNKED_LENGTH are split into paragraph-aligned chunks of about
+# CHUNK_SIZE characters that are analyzed in parallel. Each chunk also starts up to
+# CHUNK_OVERLAP characters before its paragraph, so a value cut off from its keyword
+# ("password is" / blank line / value) is still found together with it.
+CHUNK_SIZE = 1200
+MIN_CHUNKED_LENGTH = 200
+CHUNK_OVERLAP = 256
+
+# Paragraphs longer than MIN_WINDOWED_LENGTH (logs, minified files) are cut into windows
+# of WINDOW_SIZE characters so spaCy never holds the whole paste in one Doc. Consecutive
+# windows share WINDOW_OVERLAP characters, more than any single entity spans, so an entity
+# cut at one window's end is found whole in the next.
+WINDOW_SIZE = 64 * 1024
+WINDOW_OVERLAP = 256
+MIN_WINDOWED_LENGTH = 128 * 1024
+
+# Blank line that doesn't follow a ':' or '=' (a password value may come after it)
+_PARAGRAPH_BREAK = re.compile(r"(?<![\s:=])[ \t\r]*\n[ \t\r]*\n")
+
+_WHITESPACE_CHAR = re.compile(r"\s")
+
+_CHUNK_EXECUTOR = None
+_CHUNK_EXECUTOR_LOCK = threading.Lock()
+
+def _chunk(text: str) -> List[Tuple[int, str]]:
+    """
+    Splits text at blank lines and packs consecutive paragraphs into chunks of about
+    CHUNK_SIZE characters, each overlapping the previous one by up to CHUNK_OVERLAP.
+    Paragraphs are only split (into overlapping windows) when longer than
+    MIN_WINDOWED_LENGTH. Returns (offset, chunk) pairs.
+    """
+    if len(text) < MIN_CHUNKED_LENGTH:
+        return [(0, text)]
+    
+    breaks = [match.end() for match in _PARAGRAPH_BREAK.finditer(text)]
+    chunks = []
+    start = 0
+    for i, end in enumerate(breaks):
+        next_end = breaks[i + 1] if i + 1 < len(breaks) else len(text)
+        # Cut here if adding the next paragraph would overflow the chunk
+        if next_end - start > CHUNK_SIZE and end > start:
+            _append_chunk(chunks, text, _overlap_start(text, start), end)
+            start = end
+    _append_chunk(chunks, text, _overlap_start(text, start), len(text))
+    
+    return chunks
+
+def _overlap_start(text: str, start: int) -> int:
+    """
+    Where the chunk for the paragraph at start begins: CHUNK_OVERLAP characters earlier,
+    moved up to the next whitespace so it doesn't begin in the middle of a word.
+    """
+    if start == 0:
+        return 0
+    lead = max(0, start - CHUNK_OVERLAP)
+    match = _WHITESPACE_CHAR.search(text, lead, start)
+    return match.start() if match else lead
+
+def _append_chunk(chunks: List[Tuple[int, str]], text: str, start: int, end: int) -> None:
+    """Appends text[start:end] as one chunk, or as overlapping windows if it's too long."""
+    if end - start <= MIN_WINDOWED_LENGTH:
+        chunks.append((start, text[start:end]))
+        return
+    
+    step = WINDOW_SIZE - WINDOW_OVERLAP
+    for offset in range(start, end - WINDOW_OVERLAP, step):
+        chunks.append((offset, text[offset:min(offset + WINDOW_SIZE, end)]))
+
+def _get_chunk_executor() -> ThreadPoolExecutor:
+    """Returns the shared thread pool for chunk analysis, creating it on first use."""
+    global _CHUNK_EXECUTOR
+    with _CHUNK_EXECUTOR_LOCK:
+        if _CHUNK_EXECUTOR is None:
+            _CHUNK_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count() or 1,
+                                                 thread_name_prefix="securepaste-chunk")
+        return _CHUNK_EXECUTOR
+
+# Regex character classes of which at least one must occur in the text for an entity's
+# recognizers to match. Entities not listed here or in ENTITY_TRIGGER_WORDS (NER-based
+# ones like PERSON) can't be ruled out this cheaply and always run the analyzer.
+ENTITY_TRIGGER_CHARS = {
+    'EMAIL_ADDRESS': '@',
+    'URL': r'.:',
+    'DOMAIN_NAME': r'.',
+    'IP_ADDRESS': r'\d:',
+    'PHONE_NUMBER': r'\d',
+    'CREDIT_CARD': r'\d',
+    'IBAN_CODE': r'\d',
+    'US_SSN': r'\d',
+    'US_BANK_NUMBER': r'\d',
+    'ABA_ROUTING_NUMBER': r'\d',
+    'UK_NHS': r'\d',
+    'AU_ABN': r'\d',
+    'AU_ACN': r'\d',
+    'AU_TFN': r'\d',
+    'AU_MEDICARE': r'\d',
+    'IN_AADHAAR': r'\d'
+}
+
+# Keywords of which at least one must occur (in any case) for an entity's recognizers to
+# match; every password format contains "password", "pwd" or "pass"
+ENTITY_TRIGGER_WORDS = {
+    'PASSWORD': ('pass', 'pwd')
+}
+
+# The only non-ASCII characters Python's IGNORECASE matches to ASCII letters:
+# dotted/dotless capital I, long s and the Kelvin sign
+_ASCII_CASE_EXTRAS = '\u0130\u0131\u017f\u212a'
+
+def _case_variants(word: str) -> List[str]:
+    """All spellings of an ASCII word that an IGNORECASE regex for it would match."""
+    options = [
+        sorted({c for c in (ch.lower(), ch.upper()) + tuple(_ASCII_CASE_EXTRAS)
+                if re.fullmatch(re.escape(ch), c, re.IGNORECASE)})
+        for ch in word
+    ]
+    return [''.join(spelling) for spelling in itertools.product(*options)]
+
+class EntityTrigger:
+    """
+    Cheap check whether any of a set of entity types can occur in a text, by looking
+    for the characters or keywords their recognizers need in a single pass each.
+    """
+    
+    def __init__(self, chars: str, words: List[str]):
+        self.char_regex = re.compile('[' + chars + ']') if chars else None
+        self.automaton = None
+        self.word_regex = None
+        if words and AHOCORASICK_AVAILABLE:
+            # Every case variant is a key of its own, so texts are scanned as they are
+            # instead of through a lowercased copy
+            self.automaton = ahocorasick.Automaton()
+            for word in words:
+                for variant in _case_variants(word):
+                    self.automaton.add_word(variant, word)
+            self.automaton.make_automaton()
+        elif words:
+            self.word_regex = re.compile('|'.join(map(re.escape, words)), re.IGNORECASE)
+    
+    def search(self, text: str) -> bool:
+        """Returns False only if none of the entity types can occur in the text."""
+        if self.char_regex is not None and self.char_regex.search(text) is not None:
+            return True
+        if self.automaton is not None:
+            return next(self.automaton.iter(text), None) is not None
+        return self.word_regex is not None and self.word_regex.search(text) is not None
+
+@lru_cache(maxsize=64)
+def _build_trigger(entity_types: Tuple[str, ...], has_custom_patterns: bool) -> Optional[EntityTrigger]:
+    """
+    Builds the EntityTrigger for the given entity types. Returns None when some entity
+    type has no known triggers, so the analyzer always has to run.
+    """
+    if has_custom_patterns or not entity_types:
+        return None
+    if any(e not in ENTITY_TRIGGER_CHARS and e not in ENTITY_TRIGGER_WORDS for e in entity_types):
+        return None
+    chars = ''.join(sorted({ENTITY_TRIGGER_CHARS[e] for e in entity_types if e in ENTITY_TRIGGER_CHARS}))
+    words = sorted({word for e in entity_types for word in ENTITY_TRIGGER_WORDS.get(e, ())})
+    return EntityTrigger(chars, words)
+
+def _results_payload(analyzer_results: List[Any]) -> Dict[str, List[Any]]:
+    """
+    Detections as parallel columns rather than a dict per result; flat lists are
+    cheaper to build and serialize when a paste has thousands of hits. Offsets only,
+    so the response doesn't carry the PII itself (see get_spans).
+    """
+    return {
+        'entity_types': [res.entity_type for res in analyzer_results],
+        'starts': [res.start for res in analyzer_results],
+        'ends': [res.end for res in analyzer_results],
+        'scores': [res.score for res in analyzer_results]
+    }
+
+class AnonymizationRequest:
+    """
+    Parsed anonymize_text config with everything needed to analyze text resolved:
+    the analyzer, the entity types to look for and the operator per entity type.
+    """
+    
+    def __init__(self, config_json: str):
+        config = _loads(config_json)
         if 'entities' not in config or not isinstance(config['entities'], list):
             raise ValueError("Invalid config: missing 'entities' list.")
         
-        entity_types = [e['type'] for e in config['entities']]
-        confidence_threshold = config.get('confidence_threshold', 0.35)
-        language = config.get('language', 'en')
+        self.confidence_threshold = config.get('confidence_threshold', 0.35)
+        self.language = config.get('language', 'en')
+        # Per-detection offsets/scores are only needed by the pattern test dialog
+        self.include_debug = bool(config.get('include_debug', False))
         custom_patterns_config = config.get('custom_patterns', [])
         
-        # Create analyzer with custom patterns for this request
-        analyzer = setup_analyzer_with_custom_patterns(custom_patterns_config)
-        if not analyzer:
+        # Get the (cached) analyzer with custom patterns for this request
+        self.analyzer = _get_analyzer(custom_patterns_config, config.get('nlp_model') or NLP_MODEL)
+        if not self.analyzer:
             raise Exception("Failed to create analyzer")
         
-        # Collect all entity types (standard + custom)
-        all_entity_types = entity_types.copy()
-        for pattern_config in custom_patterns_config:
-            if pattern_config.get('enabled', True):
-                entity_type = pattern_config['entity_type']
-                if entity_type not in all_entity_types:
-                    all_entity_types.append(entity_type)
-        
-        # Analyze text for PII entities
-        analyzer_results = analyzer.analyze(
-            text=text,
-            entities=all_entity_types,
-            language=language,
-            score_threshold=confidence_threshold
-        )
-        
-        # Build operators dictionary for ALL configured entity types
-        operators = {}
-        entity_config_map = {e['type']: e for e in config['entities']}
-        
-        # Pre-define operators for standard entity types
-        for entity_config in config['entities']:
-            operators[entity_config['type']] = create_operator_config(
-                entity_config['anonymization_method'],
-                entity_config.get('custom_replacement')
+        # Operator per entity type, built in a single pass over each list (custom
+        # patterns win). Its keys are the entity types to detect.
+        self.operators = {}
+        for e in config['entities']:
+            self.operators[e['type']] = create_operator_config(
+                e['anonymization_method'], e.get('custom_replacement')
             )
-        
-        # Add operators for custom patterns
+        has_custom_patterns = False
         for pattern_config in custom_patterns_config:
             if pattern_config.get('enabled', True):
-                entity_type = pattern_config['entity_type']
-                operators[entity_type] = create_operator_config(
+                has_custom_patterns = True
+                self.operators[pattern_config['entity_type']] = create_operator_config(
                     pattern_config.get('anonymization_method', 'redact'),
                     pattern_config.get('custom_replacement')
                 )
         
+        self.entity_types = list(self.operators)
+        
+        # spaCy components this request's recognizers don't need (NER unless the
+        # SpacyRecognizer serves one of its entity types)
+        self.disabled_components = []
+        if isinstance(self.analyzer.nlp_engine, TrimmedSpacyNlpEngine) and not self._needs_ner():
+            self.disabled_components = TrimmedSpacyNlpEngine.NER_COMPONENTS
+        
         # Add DEFAULT operator as fallback
-        if 'DEFAULT' not in operators:
-            operators['DEFAULT'] = OperatorConfig('replace', {'new_value': '[REDACTED]'})
+        self.operators.setdefault('DEFAULT', create_operator_config('replace'))
+        self.trigger = _build_trigger(tuple(self.entity_types), has_custom_patterns)
+    
+    def _needs_ner(self) -> bool:
+        if not self.entity_types:
+            return False
+        try:
+            recognizers = self.analyzer.registry.get_recognizers(self.language, self.entity_types)
+        except ValueError:
+            # No recognizer for some entity type; analyze() reports it, keep the full pipeline
+            return True
+        return any(isinstance(recognizer, SpacyRecognizer) for recognizer in recognizers)
+    
+    def may_contain_entities(self, text: str) -> bool:
+        """Cheap check whether any of the configured entity types can occur in the text."""
+        # Nothing configured means nothing to find (Presidio would take an empty entity
+        # list as "all entities")
+        if not self.entity_types or not text or text.isspace():
+            return False
+        return self.trigger is None or self.trigger.search(text)
+    
+    def analyze(self, text: str, nlp_artifacts=None) -> List[Any]:
+        """Analyzes the text for the configured entity types."""
+        # Skip spaCy and all recognizers when nothing can match
+        if not self.may_contain_entities(text):
+            return []
+        
+        chunks = _chunk(text) if nlp_artifacts is None else [(0, text)]
+        if len(chunks) == 1:
+            analyzer_results = self._analyze_chunk(text, nlp_artifacts)
+        else:
+            # spaCy releases the GIL in its forward pass, so chunks overlap in threads
+            analyzer_results = []
+            seen = set()
+            chunk_results = _get_chunk_executor().map(lambda chunk: self._analyze_chunk(chunk[1]), chunks)
+            for (offset, _), results in zip(chunks, chunk_results):
+                for res in results:
+                    res.start += offset
+                    res.end += offset
+                    # Entities inside a chunk or window overlap are found by both chunks
+                    key = (res.entity_type, res.start, res.end)
+                    if key not in seen:
+                        seen.add(key)
+                        analyzer_results.append(res)
         
-        # Anonymize the text
-        anonymized_result = ANONYMIZER.anonymize(
+        return remove_contained_results(analyzer_results)
+    
+    def process_batch(self, texts: List[str]):
+        """Runs spaCy over the texts in one nlp.pipe() pass, yielding (text, nlp_artifacts)."""
+        nlp_engine = self.analyzer.nlp_engine
+        if self.disabled_components:
+            return nlp_engine.process_batch(texts, self.language, batch_size=NLP_BATCH_SIZE,
+                                            disable=self.disabled_components)
+        return nlp_engine.process_batch(texts, self.language, batch_size=NLP_BATCH_SIZE)
+    
+    def _analyze_chunk(self, text: str, nlp_artifacts=None) -> List[Any]:
+        if nlp_artifacts is None and self.disabled_components:
+            nlp_artifacts = self.analyzer.nlp_engine.process_text(text, self.language,
+                                                                  disable=self.disabled_components)
+        return self.analyzer.analyze(
             text=text,
-            analyzer_results=analyzer_results,
-            operators=operators
+            entities=self.entity_types,
+            language=self.language,
+            score_threshold=self.confidence_threshold,
+            nlp_artifacts=nlp_artifacts
         )
+    
+    def build_response(self, text: str, analyzer_results: List[Any]) -> Dict[str, Any]:
+        """Anonymizes the text with the analyzer results and builds the success payload."""
+        anonymized_text = text
+        if analyzer_results:
+            anonymized_text = ANONYMIZER.anonymize(
+                text=text,
+                analyzer_results=analyzer_results,
+                operators=self.operators
+            ).text
         
         # Count entities found
-        entities_found = {}
-        for res in analyzer_results:
-            entities_found[res.entity_type] = entities_found.get(res.entity_type, 0) + 1
+        entities_found = dict(Counter(res.entity_type for res in analyzer_results))
         
-        return json.dumps({
+        response = {
             'success': True,
-            'anonymized_text': anonymized_result.text,
+            'anonymized_text': anonymized_text,
             'entities_found': entities_found,
-            'total_entities': len(analyzer_results),
-            'analyzer_results': [
-                {
-                    'entity_type': res.entity_type,
-                    'start': res.start,
-                    'end': res.end,
-                    'score': res.score,
-                    'text': text[res.start:res.end]
-                } for res in analyzer_results
-            ]
-        })
+            'total_entities': len(analyzer_results)
+        }
+        if self.include_debug:
+            response['analyzer_results'] = _results_payload(analyzer_results)
+        return response
+
+@lru_cache(maxsize=16)
+def _get_request(config_json: str) -> AnonymizationRequest:
+    """
+    Parses the config once per distinct config_json string. The C# side sends the same
+    config for every paste until settings change, and requests are read-only once built.
+    """
+    return AnonymizationRequest(config_json)
+
+# Responses for recently anonymized (config, text) pairs, keyed by their hashes (LRU order),
+# so pastes that are resubmitted (retries, undo/redo) aren't analyzed again. Only the
+# anonymized output is kept, never the original text.
+RESULT_CACHE_SIZE = 256
+RESULT_CACHE_MAX_TEXT_LENGTH = 64 * 1024
+_RESULT_CACHE: "OrderedDict[Tuple[bytes, bytes], Dict[str, Any]]" = OrderedDict()
+_RESULT_CACHE_LOCK = threading.Lock()
+
+def _result_cache_key(text: str, config_json: str) -> Tuple[bytes, bytes]:
+    """blake2b digests of the config and the text."""
+    return (
+        hashlib.blake2b(config_json.encode('utf-8', 'surrogatepass'), digest_size=16).digest(),
+        hashlib.blake2b(text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+    )
+
+def _anonymize(text: str, config_json: str) -> Dict[str, Any]:
+    """
+    Analyzes and anonymizes the text, returning the response payload. Successful
+    responses for texts up to RESULT_CACHE_MAX_TEXT_LENGTH are memoized.
+    """
+    if not text or len(text) > RESULT_CACHE_MAX_TEXT_LENGTH:
+        return _anonymize_uncached(text, config_json)
+    
+    key = _result_cache_key(text, config_json)
+    with _RESULT_CACHE_LOCK:
+        response = _RESULT_CACHE.get(key)
+        if response is not None:
+            _RESULT_CACHE.move_to_end(key)
+            return response
+    
+    response = _anonymize_uncached(text, config_json)
+    if response.get('success'):
+        with _RESULT_CACHE_LOCK:
+            _RESULT_CACHE[key] = response
+            while len(_RESULT_CACHE) > RESULT_CACHE_SIZE:
+                _RESULT_CACHE.popitem(last=False)
+    return response
+
+def _anonymize_uncached(text: str, config_json: str) -> Dict[str, Any]:
+    """Analyzes and anonymizes the text, returning the response payload."""
+    if not PRESIDIO_AVAILABLE:
+        return {
+            'success': False,
+            'error': f'Presidio not available: {PRESIDIO_ERROR}',
+            'anonymized_text': text
+        }
+    
+    # Nothing to anonymize in empty or whitespace-only text
+    if not text or text.isspace():
+        return {
+            'success': True,
+            'anonymized_text': text,
+            'entities_found': {},
+            'total_entities': 0
+        }
+    
+    try:
+        request = _get_request(config_json)
+        
+        # Analyze text for PII entities
+        analyzer_results = request.analyze(text)
+        
+        return request.build_response(text, analyzer_results)
         
     except Exception as e:
-        return json.dumps({
+        return {
             'success': False,
             'error': str(e),
             'anonymized_text': text
-        })
+        }
+
+def anonymize_text(text: str, config_json: str) -> str:
+    """Main function called from C#. High-throughput callers should prefer anonymize_text_b."""
+    return _dumps(_anonymize(text, config_json))
+
+def anonymize_text_b(text_utf8: bytes, config_utf8: bytes) -> bytes:
+    """
+    Bytes-in/bytes-out variant of anonymize_text: takes UTF-8 encoded text and config and
+    returns the UTF-8 encoded JSON result, so the host marshals byte arrays instead of strings.
+    """
+    try:
+        text = text_utf8.decode('utf-8')
+        config_json = config_utf8.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # No anonymized_text: the input can't be echoed back, and the host keeps its own copy
+        return _dumps_bytes({'success': False, 'error': f'Input is not valid UTF-8: {e}'})
+    return _dumps_bytes(_anonymize(text, config_json))
+
+def anonymize_text_native(text: str, config_json: str) -> Dict[str, Any]:
+    """
+    Same as anonymize_text, but returns the result dict itself instead of encoding it as
+    JSON. The dict may be shared with the result cache and must not be modified.
+    """
+    return _anonymize(text, config_json)
+
+# Number of texts spaCy processes together in anonymize_texts
+NLP_BATCH_SIZE = 32
+
+def anonymize_texts(texts: List[str], config_json: str) -> List[str]:
+    """
+    Batch variant of anonymize_text, called from C# when several pastes are queued.
+    All texts go through spaCy in one nlp.pipe() pass instead of one document at a time.
+    Returns one anonymize_text-style JSON result per input text, in the same order.
+    """
+    if not PRESIDIO_AVAILABLE:
+        return [anonymize_text(text, config_json) for text in texts]
+    
+    try:
+        request = _get_request(config_json)
+        
+        # Only texts that can contain a configured entity go through spaCy
+        candidates = [request.may_contain_entities(text) for text in texts]
+        nlp_batch = iter(request.process_batch(
+            [text for text, candidate in zip(texts, candidates) if candidate]
+        ))
+        
+        results = []
+        for text, candidate in zip(texts, candidates):
+            try:
+                analyzer_results = []
+                if candidate:
+                    _, nlp_artifacts = next(nlp_batch)
+                    analyzer_results = request.analyze(text, nlp_artifacts)
+                results.append(_dumps(request.build_response(text, analyzer_results)))
+            except Exception as e:
+                results.append(_dumps({'success': False, 'error': str(e), 'anonymized_text': text}))
+        
+        return results
+        
+    except Exception as e:
+        return [_dumps({'success': False, 'error': str(e), 'anonymized_text': text}) for text in texts]
+
+def get_spans(text: str, starts: List[int], ends: List[int]) -> List[str]:
+    """
+    Returns text[start:end] for each offset pair of an anonymize_text response, in one
+    call. Offsets are in code points, which C# strings (UTF-16) can't index directly.
+    """
+    return [text[start:end] for start, end in zip(starts, ends)]
 
 def test_presidio_installation() -> str:
+    """Checks the shared engines, waiting for the background warmup to finish first."""
     if not PRESIDIO_AVAILABLE:
-        return json.dumps({'success': False, 'error': PRESIDIO_ERROR})
+        return _dumps({'success': False, 'error': PRESIDIO_ERROR})
     try:
-        _ = AnalyzerEngine()
-        _ = AnonymizerEngine()
-        return json.dumps({'success': True, 'message': 'Presidio is working correctly'})
+        warmed_up = _warmup_done.wait(WARMUP_TIMEOUT_SECONDS)
+        if ANALYZER is None or ANONYMIZER is None:
+            raise Exception("Presidio engines failed to initialize")
+        
+        # End to end through the entry point the app anonymizes pastes with
+        config = _dumps_bytes({'entities': [{'type': 'PASSWORD', 'anonymization_method': 'redact'}]})
+        result = _loads(anonymize_text_b(b"password: mySecretPass123", config))
+        if not result.get('success') or 'mySecretPass123' in result.get('anonymized_text', ''):
+            raise Exception(f"anonymize_text_b did not anonymize the test text: {result.get('error', result)}")
+        
+        # Entity counts after dropping contained results, for equal, contained and
+        # partially overlapping spans
+        contained_cases = [
+            ([('EMAIL_ADDRESS', 0, 20, 1.0), ('URL', 0, 20, 0.5)], {'EMAIL_ADDRESS': 1}),
+            ([('PERSON', 0, 5, 0.85), ('LOCATION', 0, 5, 0.85)], {'LOCATION': 1}),
+            ([('EMAIL_ADDRESS', 0, 20, 1.0), ('URL', 5, 20, 0.5)], {'EMAIL_ADDRESS': 1}),
+            ([('PERSON', 0, 20, 0.5), ('PHONE_NUMBER', 5, 15, 0.9)], {'PERSON': 1, 'PHONE_NUMBER': 1}),
+            ([('PASSWORD', 0, 10, 0.8), ('URL', 5, 20, 0.5)], {'PASSWORD': 1, 'URL': 1})
+        ]
+        for spans, expected in contained_cases:
+            kept = remove_contained_results([RecognizerResult(*span) for span in spans])
+            counts = dict(Counter(res.entity_type for res in kept))
+            if counts != expected:
+                raise Exception(f"remove_contained_results kept {counts} of {spans}, expected {expected}")
+        return _dumps({'success': True, 'message': 'Presidio is working correctly', 'warmed_up': warmed_up})
     except Exception as e:
-        return json.dumps({'success': False, 'error': str(e)})
+        return _dumps({'success': False, 'error': str(e)})
 
 def test_password_recognizer() -> str:
     """Test function to verify the custom password recognizer is working correctly."""
     if not PRESIDIO_AVAILABLE:
-        return json.dumps({'success': False, 'error': PRESIDIO_ERROR})
+        return _dumps({'success': False, 'error': PRESIDIO_ERROR})
     
     try:
         # Test cases for different password patterns
@@ -330,55 +1310,69 @@ def test_password_recognizer() -> str:
                         'entity_type': res.entity_type,
                         'start': res.start,
                         'end': res.end,
-                        'score': res.score,
-                        'detected_text': test_text[res.start:res.end]
+                        'score': res.score
                     } for res in analyzer_results
                 ]
             })
         
-        return json.dumps({
-            'success': True, 
-            'message': 'Password recognizer test completed',
+        # Pastes long enough to be analyzed in chunks, with the chunk cut between the
+        # keyword and its value; the value must still be found and redacted
+        filler = "The quarterly report covers revenue, hiring and the office move. " * 17
+        notes = " Remaining notes about the schedule for next week." * 6
+        chunked_cases = [
+            (filler + "my password is\n\nlongSecretValue1" + notes, "longSecretValue1"),
+            (filler + "username=bob\n\npassword=hunter2222" + notes, "hunter2222"),
+            (filler + 'password="abc def\n\nghijklmn"' + notes, "ghijklmn")
+        ]
+        config = _dumps({
+            'entities': [{'type': 'PASSWORD', 'anonymization_method': 'redact'}],
+            'include_debug': True
+        })
+        leaked = False
+        for test_text, secret in chunked_cases:
+            response = _anonymize(test_text, config)
+            found = secret not in response.get('anonymized_text', test_text)
+            leaked = leaked or not found
+            results.append({
+                'text': test_text[len(filler):-len(notes)],
+                'chunks': len(_chunk(test_text)),
+                'found_passwords': response.get('total_entities', 0),
+                'redacted': found,
+                'scores': response.get('analyzer_results', {}).get('scores', [])
+            })
+        
+        return _dumps_indented({
+            'success': not leaked, 
+            'message': 'Password recognizer test completed' if not leaked else 'A chunked password was not redacted',
             'test_results': results
-        }, indent=2)
+        })
         
     except Exception as e:
-        return json.dumps({'success': False, 'error': str(e)})
+        return _dumps({'success': False, 'error': str(e)})
 
 def validate_regex_patterns() -> str:
     """Validate that all regex patterns compile correctly."""
     try:
-        import re
-        patterns = [
-            r"(?i)(?:password|pwd|pass)\s*:\s*([^\s\'\"]{6,})",
-            r"(?i)(?:password|pwd|pass)\s*=\s*([^\s\'\"]{6,})",
-            r"(?i)(?:password|pwd|pass)\s+is\s+([^\s\'\"]{6,})",
-            r"(?i)(?:password|pwd|pass)\s*[:=]\s*\"([^\"]{6,})\"",
-            r"(?i)(?:password|pwd|pass)\s*[:=]\s*'([^']{6,})'",
-            r"(?i)(?:username|user|login)\s*[:=]\s*\S+\s+(?:password|pwd|pass)\s*[:=]\s*([^\s\'\"]{6,})"
-        ]
-        
-        for i, pattern in enumerate(patterns):
-            re.compile(pattern)
+        # The password patterns are compiled once at import; check the compiled
+        # forms instead of recompiling them
+        pattern = PasswordPatternRecognizer.UNIFIED_PATTERN
+        if set(pattern.groupindex) != set(PasswordPatternRecognizer.GROUP_SCORES) or pattern.groups != len(pattern.groupindex):
+            raise ValueError(f'capture groups {sorted(pattern.groupindex)} do not match the scored formats')
+        for recognizer_pattern in PasswordPatternRecognizer.PATTERNS:
+            if recognizer_pattern.compiled_regex is None:
+                raise ValueError(f"pattern '{recognizer_pattern.name}' is not compiled")
         
-        return json.dumps({'success': True, 'message': 'All regex patterns are valid'})
+        return _dumps({'success': True, 'message': 'All regex patterns are valid'})
     except Exception as e:
-        return json.dumps({'success': False, 'error': f'Pattern validation failed: {str(e)}'})
+        return _dumps({'success': False, 'error': f'Pattern validation failed: {str(e)}'})
 
 def test_custom_pattern(pattern_config_json: str, test_text: str) -> str:
     """Test function to verify a custom pattern works correctly."""
     if not PRESIDIO_AVAILABLE:
-        return json.dumps({'success': False, 'error': PRESIDIO_ERROR})
+        return _dumps({'success': False, 'error': PRESIDIO_ERROR})
     
     try:
-        pattern_config = json.loads(pattern_config_json)
-        
-        # Create a temporary analyzer with just this pattern
-        analyzer = AnalyzerEngine()
-        
-        # Add the password recognizer for completeness
-        password_recognizer = PasswordPatternRecognizer()
-        analyzer.registry.add_recognizer(password_recognizer)
+        pattern_config = _loads(pattern_config_json)
         
         # Add the custom pattern
         try:
@@ -394,7 +1388,9 @@ def test_custom_pattern(pattern_config_json: str, test_text: str) -> str:
                 entity_type=pattern_config['entity_type']
             )
             
-            analyzer.registry.add_recognizer(recognizer)
+            # Reuse the shared analyzer's NLP engine and recognizers (including
+            # the password recognizer) instead of loading spaCy again
+            analyzer = _clone_analyzer(ANALYZER, [recognizer])
             
             # Test the pattern
             analyzer_results = analyzer.analyze(
@@ -404,7 +1400,7 @@ def test_custom_pattern(pattern_config_json: str, test_text: str) -> str:
                 score_threshold=0.1  # Low threshold for testing
             )
             
-            return json.dumps({
+            return _dumps({
                 'success': True,
                 'pattern_name': pattern_config['name'],
                 'entity_type': pattern_config['entity_type'],
@@ -421,50 +1417,196 @@ def test_custom_pattern(pattern_config_json: str, test_text: str) -> str:
             })
             
         except Exception as pattern_error:
-            return json.dumps({
+            return _dumps({
                 'success': False,
                 'error': f'Pattern error: {str(pattern_error)}',
                 'pattern_name': pattern_config.get('name', 'unknown')
             })
         
     except Exception as e:
-        return json.dumps({'success': False, 'error': str(e)})
+        return _dumps({'success': False, 'error': str(e)})
 
 def validate_custom_pattern(pattern_json: str) -> str:
     """Validate a custom pattern without executing it."""
     try:
-        pattern_config = json.loads(pattern_json)
+        pattern_config = _loads(pattern_json)
         
         # Check required fields
         required_fields = ['name', 'pattern', 'entity_type']
         for field in required_fields:
             if not pattern_config.get(field):
-                return json.dumps({'success': False, 'error': f'Missing required field: {field}'})
+                return _dumps({'success': False, 'error': f'Missing required field: {field}'})
         
         # Validate regex pattern
-        import re
         try:
-            re.compile(pattern_config['pattern'])
-        except re.error as e:
-            return json.dumps({'success': False, 'error': f'Invalid regex pattern: {str(e)}'})
+            _compile_pattern(pattern_config['pattern'])
+        except regex.error as e:
+            return _dumps({'success': False, 'error': f'Invalid regex pattern: {str(e)}'})
         
         # Validate confidence score
         confidence = pattern_config.get('confidence_score', 0.8)
         if not isinstance(confidence, (int, float)) or confidence < 0.1 or confidence > 1.0:
-            return json.dumps({'success': False, 'error': 'Confidence score must be between 0.1 and 1.0'})
+            return _dumps({'success': False, 'error': 'Confidence score must be between 0.1 and 1.0'})
         
         # Validate anonymization method
         valid_methods = ['redact', 'replace', 'mask', 'hash', 'encrypt']
         method = pattern_config.get('anonymization_method', 'redact')
         if method not in valid_methods:
-            return json.dumps({'success': False, 'error': f'Invalid anonymization method. Must be one of: {", ".join(valid_methods)}'})
+            return _dumps({'success': False, 'error': f'Invalid anonymization method. Must be one of: {", ".join(valid_methods)}'})
         
-        return json.dumps({'success': True, 'message': 'Pattern validation passed'})
+        return _dumps({'success': True, 'message': 'Pattern validation passed'})
         
     except json.JSONDecodeError as e:
-        return json.dumps({'success': False, 'error': f'Invalid JSON: {str(e)}'})
+        return _dumps({'success': False, 'error': f'Invalid JSON: {str(e)}'})
     except Exception as e:
-        return json.dumps({'success': False, 'error': str(e)})
+        return _dumps({'success': False, 'error': str(e)})
 
 def get_python_version() -> str:
     return f"Python {sys.version}"
+
+# Request-level parallelism: whole batches are spread over worker processes, each with
+# its own analyzer, since the Python glue around spaCy serializes on the GIL.
+# Half the logical CPUs approximates the physical cores (one spaCy model per worker).
+PROCESS_POOL_WORKERS = max(1, (os.cpu_count() or 2) // 2)
+PARALLEL_MIN_BATCH = 8
+_PROCESS_POOL = None
+_PROCESS_POOL_LOCK = threading.Lock()
+
+def _worker_executable() -> str:
+    """Python interpreter for pool workers; inside the C# host sys.executable is the host .exe."""
+    if os.path.basename(sys.executable).lower().startswith('python'):
+        return sys.executable
+    for candidate in (os.path.join(sys.prefix, 'Scripts', 'python.exe'),
+                      os.path.join(sys.prefix, 'python.exe'),
+                      os.path.join(sys.prefix, 'bin', 'python3')):
+        if os.path.exists(candidate):
+            return candidate
+    return sys.executable
+
+class _WorkerProcess(multiprocessing.context.SpawnProcess):
+    """
+    Spawned process started with _worker_executable(). The spawn executable is a
+    process-wide setting, so it is only swapped in while the worker is being started.
+    """
+    
+    _executable_lock = threading.Lock()
+    
+    @staticmethod
+    def _Popen(process_obj):
+        with _WorkerProcess._executable_lock:
+            previous = multiprocessing.spawn.get_executable()
+            multiprocessing.spawn.set_executable(_worker_executable())
+            try:
+                return multiprocessing.context.SpawnProcess._Popen(process_obj)
+            finally:
+                multiprocessing.spawn.set_executable(previous)
+
+class _WorkerContext(multiprocessing.context.SpawnContext):
+    Process = _WorkerProcess
+
+def _init_worker():
+    """Waits in each worker until its module-level ANALYZER and ANONYMIZER are warm."""
+    _warmup_done.wait(WARMUP_TIMEOUT_SECONDS)
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    """Returns the shared worker process pool, starting it on first use."""
+    global _PROCESS_POOL
+    with _PROCESS_POOL_LOCK:
+        if _PROCESS_POOL is None:
+            _PROCESS_POOL = ProcessPoolExecutor(
+                max_workers=PROCESS_POOL_WORKERS,
+                mp_context=_WorkerContext(),
+                initializer=_init_worker
+            )
+        return _PROCESS_POOL
+
+def anonymize_texts_parallel(texts: List[str], config_json: str) -> List[str]:
+    """
+    Like anonymize_texts, but splits the batch over PROCESS_POOL_WORKERS processes.
+    Small batches (or a single worker) stay in-process, where latency is lower.
+    """
+    global _PROCESS_POOL
+    if not PRESIDIO_AVAILABLE or PROCESS_POOL_WORKERS < 2 or len(texts) < PARALLEL_MIN_BATCH:
+        return anonymize_texts(texts, config_json)
+    
+    # One contiguous sub-batch per worker, so each still gets a single nlp.pipe() pass
+    size = -(-len(texts) // PROCESS_POOL_WORKERS)
+    batches = [texts[i:i + size] for i in range(0, len(texts), size)]
+    try:
+        pool = _get_process_pool()
+        futures = [pool.submit(anonymize_texts, batch, config_json) for batch in batches]
+        return [result for future in futures for result in future.result()]
+    except Exception as e:
+        print(f"Process pool failed, anonymizing in-process: {e}")
+        with _PROCESS_POOL_LOCK:
+            if _PROCESS_POOL is not None:
+                _PROCESS_POOL.shutdown(wait=False, cancel_futures=True)
+                _PROCESS_POOL = None
+        return anonymize_texts(texts, config_json)
+
+# Set once the background warmup has run the analyzer and JIT kernels
+_warmup_done = threading.Event()
+WARMUP_TIMEOUT_SECONDS = 60
+
+def _warmup():
+    """Runs spaCy, the recognizers and the Numba kernels once so the first paste finds them hot."""
+    global NUMBA_AVAILABLE
+    try:
+        if ANALYZER is not None:
+            # PERSON goes through the spaCy NER recognizer, PHONE_NUMBER through phonenumbers
+            ANALYZER.analyze(text='warmup abc', entities=['PERSON', 'PHONE_NUMBER'], language='en',
+                             score_threshold=0.99)
+            for recognizer in ANALYZER.registry.recognizers:
+                _get_prefilter(recognizer)
+        if NUMBA_AVAILABLE:
+            try:
+                _mark_contained_jit(np.zeros(1, np.int64), np.zeros(1, np.int64), np.zeros(1, np.float64),
+                                    np.zeros(1, np.int64), np.ones(1, np.bool_))
+                _find_password_anchor_jit(np.frombuffer(b'warmup', np.uint8))
+            except Exception:
+                NUMBA_AVAILABLE = False
+    except Exception as e:
+        print(f"Warmup failed: {e}")
+    finally:
+        _warmup_done.set()
+
+# Warm up off the caller's thread instead of on the first anonymize_text call.
+# SECUREPASTE_PRELOAD=0 skips it (e.g. for scripts that only import the module).
+if os.environ.get("SECUREPASTE_PRELOAD", "1") != "0":
+    threading.Thread(target=_warmup, name="securepaste-warmup", daemon=True).start()
+else:
+    _warmup_done.set()
+
+def serve() -> None:
+    """
+    Request loop for hosts that run this module as a separate process instead of embedding
+    it: reads msgpack maps {"text": ..., "config": <anonymize_text config JSON>} from stdin
+    and writes one msgpack-encoded anonymize_text result per request to stdout, in order.
+    Runs until stdin is closed.
+    """
+    if not MSGPACK_AVAILABLE:
+        raise RuntimeError("serve() requires msgpack (pip install msgpack)")
+    
+    # stdout carries the responses; diagnostics printed by the module go to stderr instead
+    output = sys.stdout.buffer
+    sys.stdout = sys.stderr
+    
+    packer = msgpack.Packer()
+    unpacker = msgpack.Unpacker(raw=False)
+    while True:
+        # read1() returns whatever the pipe has instead of waiting for a full buffer, so
+        # each request is answered as soon as it arrives
+        data = sys.stdin.buffer.read1(65536)
+        if not data:
+            break
+        unpacker.feed(data)
+        for request in unpacker:
+            try:
+                response = anonymize_text_native(request['text'], request['config'])
+            except Exception as e:
+                response = {'success': False, 'error': f'Invalid request: {e}'}
+            output.write(packer.pack(response))
+            output.flush()
+
+if __name__ == "__main__":
+    serve()
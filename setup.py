@@ -0,0 +1,29 @@
+"""
+Optional native build of the SecurePaste Python module.
+
+    pip install cython
+    python setup.py build_ext --inplace
+
+compiles SecurePaste/securepaste_anonymizer.py into a C extension (.pyd/.so) next to
+the .py, which Python then imports instead of the source. The .py stays the source of
+truth: CSnakes generates the C# bindings from it, and without the extension it runs as is.
+The app only ships the extension when built with -p:BuildNativeAnonymizer=true, which
+reruns this on every build so the extension can't fall behind the source.
+"""
+
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name="securepaste-anonymizer",
+    # Top-level module living in SecurePaste/, so --inplace puts the extension there
+    package_dir={"": "SecurePaste"},
+    ext_modules=cythonize(
+        "SecurePaste/securepaste_anonymizer.py",
+        compiler_directives={
+            "language_level": 3,
+            "boundscheck": False,
+            "wraparound": False
+        }
+    )
+)